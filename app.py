@@ -6,6 +6,8 @@ import re
 import json
 import io
 from datetime import datetime, timedelta
+from report_fields import field_keys
+from revision_journal import open_journal, record_revision, list_revisions, restore_revision, diff_revisions, journal_keys
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="LabOps Report Tool", layout="wide")
@@ -22,38 +24,6 @@ st.markdown("""
 # --- FILE PERSISTENCE (MEMORY) ---
 STATE_FILE = "investigation_state.json"
 
-field_keys = [
-    "oos_id", "client_name", "sample_id", "test_date", "sample_name", "lot_number", 
-    "dosage_form", "monthly_cleaning_date", 
-    "prepper_initial", "prepper_name", 
-    "analyst_initial", "analyst_name",
-    "changeover_initial", "changeover_name",
-    "reader_initial", "reader_name",
-    "bsc_id", "chgbsc_id", "scan_id", 
-    "shift_number", "active_platform",
-    "org_choice", "manual_org", "test_record", "control_pos", "control_lot", 
-    "control_exp", "obs_pers", "etx_pers", "id_pers", "obs_surf", "etx_surf", 
-    "id_surf", "obs_sett", "etx_sett", "id_sett", "obs_air", "etx_air_weekly", 
-    "id_air_weekly", "obs_room", "etx_room_weekly", "id_room_wk_of", "weekly_init", 
-    "date_weekly", "equipment_summary", "narrative_summary", "em_details", 
-    "sample_history_paragraph", "incidence_count", "oos_refs",
-    "other_positives", "cross_contamination_summary",
-    "total_pos_count_num", "current_pos_order",
-    "diff_changeover_bsc", "has_prior_failures",
-    "em_growth_observed", "diff_changeover_analyst",
-    "diff_reader_analyst",
-    "em_growth_count" 
-]
-# Dynamic keys
-for i in range(20):
-    field_keys.append(f"other_id_{i}")
-    field_keys.append(f"other_order_{i}")
-    field_keys.append(f"prior_oos_{i}")
-    field_keys.append(f"em_cat_{i}")
-    field_keys.append(f"em_obs_{i}")
-    field_keys.append(f"em_etx_{i}")
-    field_keys.append(f"em_id_{i}")
-
 def load_saved_state():
     if os.path.exists(STATE_FILE):
         try:
@@ -72,6 +42,34 @@ def save_current_state():
             json.dump(data_to_save, f)
     except Exception as e:
         st.error(f"Could not save state: {e}")
+    save_revision()
+
+# Radio that decides whether each journaled field is editable or canned text
+journal_toggles = {
+    "narrative_summary": "em_growth_observed", "em_details": "em_growth_observed",
+    "sample_history_paragraph": "has_prior_failures",
+    "cross_contamination_summary": "other_positives",
+}
+
+def journal_oos_id():
+    # Stripped OOS number, or "" while it is blank / still the "N/A" default
+    oos_id = str(st.session_state.oos_id).strip()
+    return "" if oos_id.upper() == "N/A" else oos_id
+
+def save_revision():
+    # Journal narrative edits per OOS number; drafts without one are not kept,
+    # and the DB is skipped when nothing changed since the last save
+    oos_id = journal_oos_id()
+    if not oos_id: return
+    current = {k: st.session_state.get(k, "") for k in journal_keys}
+    if st.session_state.get("journal_last") == (oos_id, current): return
+    try:
+        conn = open_journal()
+        try: record_revision(conn, oos_id, current)
+        finally: conn.close()
+        st.session_state.journal_last = (oos_id, current)
+    except Exception as e:
+        st.error(f"Could not save revision: {e}")
 
 # --- HELPER FUNCTIONS ---
 def clean_filename(text):
@@ -360,6 +358,38 @@ with st.sidebar:
     if st.button("💾 Save Current Inputs"): save_current_state()
     st.success(f"Active: {st.session_state.active_platform}")
 
+    # --- NARRATIVE HISTORY ---
+    history_oos_id = journal_oos_id()
+    if history_oos_id:
+        with st.expander("🕘 Narrative History"):
+            conn = open_journal()
+            try:
+                revs = list_revisions(conn, history_oos_id)
+                if not revs:
+                    st.caption("No saved revisions for this OOS yet.")
+                else:
+                    rev_nums = [r["rev"] for r in revs]
+                    labels = {r["rev"]: f"Rev {r['rev']} ({r['saved_at']})" for r in revs}
+                    pick = st.selectbox("Revision", rev_nums[::-1], format_func=lambda r: labels[r])
+                    diffs = diff_revisions(conn, history_oos_id, pick, rev_nums[-1])
+                    if not diffs: st.caption("Same as latest revision.")
+                    for key, text in diffs.items():
+                        st.caption(key)
+                        st.code(text, language="diff")
+                    if st.button("⏪ Restore Revision"):
+                        restored = restore_revision(conn, history_oos_id, pick)
+                        for key, value in restored.items():
+                            # While its toggle is "No" a field is reset to canned text on every
+                            # run, so switch the toggle on to keep restored text that differs
+                            toggle = journal_toggles[key]
+                            if st.session_state[toggle] == "No" and value != st.session_state.get(key, ""):
+                                st.session_state[toggle] = "Yes"
+                            st.session_state[key] = value
+                        save_current_state()
+                        st.rerun()
+            finally:
+                conn.close()
+
 st.title(f"LabOps Report Tool: {st.session_state.active_platform}")
 
 # --- SMART PARSER ---
@@ -0,0 +1,225 @@
+"""Bulk import of previously issued OOS reports into the investigation store.
+
+Usage:
+    python backfill.py ARCHIVE_DIR [ARCHIVE_DIR ...] [--workers N] [--db PATH]
+
+Filled PDFs are read back through their AcroForm fields, translated to app
+keys with pdf_field_map (the template's fields are mostly generic names like
+"Text Field4"). Rendered DOCX reports are matched against the platform's DOCX
+template: every table cell / paragraph, in the body and in page headers,
+holding {{ placeholders }} becomes a regex, so values are pulled from the same
+positions the app rendered them into. The OOS number is read from the page
+header; the app's output file name is only a fallback.
+
+Files are parsed in a process pool and saved in batches; a file whose size
+and mtime are already recorded in the store is skipped, so an interrupted run
+picks up where it stopped. A file with no recognisable report content or no
+OOS number is recorded as an import error rather than an investigation.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+from docx import Document
+from pypdf import PdfReader
+
+from investigation_store import STORE_FILE, open_store, imported_sources, failed_sources, save_records
+from report_fields import field_keys, pdf_field_map
+
+PLATFORMS = ["ScanRDI", "Celsis", "USP 71"]
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Template placeholders that are renamed in final_data before rendering
+docx_aliases = {
+    "control_positive": "control_pos", "control_data": "control_exp",
+    "weekly_initial": "weekly_init", "date_of_weekly": "date_weekly",
+    "obs_pers_dur": "obs_pers", "etx_pers_dur": "etx_pers", "id_pers_dur": "id_pers",
+    "obs_surf_dur": "obs_surf", "etx_surf_dur": "etx_surf", "id_surf_dur": "id_surf",
+    "obs_sett_dur": "obs_sett", "etx_sett_dur": "etx_sett", "id_sett_dur": "id_sett",
+    "obs_air_wk_of": "obs_air", "etx_air_wk_of": "etx_air_weekly", "id_air_wk_of": "id_air_weekly",
+    "obs_room_wk_of": "obs_room", "etx_room_wk_of": "etx_room_weekly",
+}
+
+# Output names used by the app's download buttons
+PDF_NAME = re.compile(r"^OOS-(?P<oos_id>\S*) (?P<client_name>.*) - (?P<active_platform>[^-]+)$")
+DOCX_NAME = re.compile(r"^OOS-(?P<oos_id>\S*) (?P<client_name>.*?)(?: \((?P<sample_id>[^()]*)\))? - (?P<active_platform>[^-]+)$")
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# The PDF analyst box lists every role, like the DOCX "Name of Analyst" cell
+PDF_PROCESSOR = re.compile(r"(?<!Changeover )Processor:\s*(?P<name>[^\n(]*?)\s*(?:\([^)]*\))?\s*(?:\n|$)")
+
+# --- DOCX TEMPLATE PATTERNS ---
+def iter_story_blocks(story, prefix=()):
+    # Stable (location, text) pairs; merged cells repeat, so keep the first copy
+    for i, p in enumerate(story.paragraphs):
+        yield prefix + ("p", i), p.text
+    for t_idx, table in enumerate(story.tables):
+        for r_idx, row in enumerate(table.rows):
+            seen = set()
+            for c_idx, cell in enumerate(row.cells):
+                if cell._tc in seen: continue
+                seen.add(cell._tc)
+                yield prefix + ("c", t_idx, r_idx, c_idx), cell.text
+
+def iter_docx_blocks(doc):
+    yield from iter_story_blocks(doc)
+    for s_idx, section in enumerate(doc.sections):
+        for name in ("header", "first_page_header"):
+            header = getattr(section, name)
+            # A linked header has no content of its own (reading it would add one)
+            if header.is_linked_to_previous: continue
+            yield from iter_story_blocks(header, ("h", s_idx, name))
+
+def block_pattern(text):
+    parts, used, pos = [], set(), 0
+    for m in PLACEHOLDER.finditer(text):
+        parts.append(re.escape(text[pos:m.start()]))
+        key = m.group(1)
+        parts.append(f"(?P={key})" if key in used else f"(?P<{key}>.*?)")
+        used.add(key)
+        pos = m.end()
+    parts.append(re.escape(text[pos:]))
+    return re.compile("".join(parts), re.DOTALL)
+
+def build_docx_patterns(template_path):
+    patterns = {}
+    for loc, text in iter_docx_blocks(Document(template_path)):
+        if PLACEHOLDER.search(text):
+            patterns[loc] = block_pattern(text)
+    return patterns
+
+_template_cache = {}
+
+def docx_patterns_for(platform, template_dir):
+    if platform not in _template_cache:
+        path = os.path.join(template_dir, f"{platform} OOS template.docx")
+        _template_cache[platform] = build_docx_patterns(path) if os.path.exists(path) else {}
+    return _template_cache[platform]
+
+# --- EXTRACTORS ---
+def fields_from_name(path, pattern):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    m = pattern.match(stem)
+    if not m: return {}
+    found = {k: v.strip() for k, v in m.groupdict().items() if v}
+    if found.get("active_platform") not in PLATFORMS: found.pop("active_platform", None)
+    return found
+
+def extract_pdf(path):
+    fields = {}
+    for name, field in (PdfReader(path).get_fields() or {}).items():
+        key = pdf_field_map.get(name)
+        if not key: continue
+        value = field.get("/V")
+        if value is None: continue
+        value = str(value).strip()
+        if key == "analyst_name" and "Processor:" in value:
+            m = PDF_PROCESSOR.search(value)
+            value = m.group("name") if m else ""
+        if value and key not in fields: fields[key] = value
+    for k, v in fields_from_name(path, PDF_NAME).items(): fields.setdefault(k, v)
+    return fields
+
+def extract_docx(path, template_dir):
+    from_name = fields_from_name(path, DOCX_NAME)
+    platform = from_name.get("active_platform", "ScanRDI")
+    patterns = docx_patterns_for(platform, template_dir)
+    fields = {}
+    matched = 0
+    for loc, text in iter_docx_blocks(Document(path)):
+        pattern = patterns.get(loc)
+        if not pattern: continue
+        m = pattern.fullmatch(text)
+        if not m: continue
+        matched += 1
+        for key, value in m.groupdict().items():
+            key = docx_aliases.get(key, key)
+            if key not in field_keys or value is None: continue
+            value = value.strip()
+            # An unrendered placeholder means this is a template copy, not a report
+            if value and "{{" not in value and key not in fields: fields[key] = value
+    if not matched: raise ValueError(f"does not match the {platform} DOCX template")
+    for k, v in from_name.items(): fields.setdefault(k, v)
+    fields.setdefault("active_platform", platform)
+    return fields
+
+def extract_report(job):
+    path, mtime, size, template_dir = job
+    kind = os.path.splitext(path)[1].lower().lstrip(".")
+    record = {"path": path, "mtime": mtime, "size": size, "kind": kind}
+    try:
+        if kind == "pdf": fields = extract_pdf(path)
+        else: fields = extract_docx(path, template_dir)
+        oos_id = re.sub(r"^OOS-", "", fields.get("oos_id", ""), flags=re.IGNORECASE).strip()
+        if not oos_id: raise ValueError("no OOS number found")
+        fields["oos_id"] = oos_id
+        record["fields"] = fields
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+# --- DRIVER ---
+def find_reports(roots):
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.startswith("~$") or " OOS template." in name: continue
+                if name.lower().endswith((".pdf", ".docx")):
+                    yield os.path.abspath(os.path.join(dirpath, name))
+
+def run_backfill(roots, db_path=STORE_FILE, workers=None, batch_size=200, retry_failed=False, template_dir=TEMPLATE_DIR, log=print):
+    conn = open_store(db_path)
+    done = imported_sources(conn)
+    if retry_failed:
+        failed_paths = failed_sources(conn)
+        done = {p: v for p, v in done.items() if p not in failed_paths}
+
+    jobs = []
+    for path in find_reports(roots):
+        st_info = os.stat(path)
+        if done.get(path) == (st_info.st_mtime, st_info.st_size): continue
+        jobs.append((path, st_info.st_mtime, st_info.st_size, os.path.abspath(template_dir)))
+    log(f"{len(jobs)} report(s) to import, {len(done)} already in {db_path}")
+    if not jobs:
+        conn.close()
+        return 0, 0
+
+    imported = failed = 0
+    pending = []
+    started = time.time()
+    chunksize = max(1, min(32, len(jobs) // ((workers or os.cpu_count() or 1) * 4)))
+    with Pool(processes=workers) as pool:
+        for record in pool.imap_unordered(extract_report, jobs, chunksize=chunksize):
+            pending.append(record)
+            if record.get("error"):
+                failed += 1
+                log(f"  ! {record['path']}: {record['error']}")
+            else:
+                imported += 1
+            if len(pending) >= batch_size:
+                save_records(conn, pending, datetime.now().isoformat(timespec="seconds"))
+                pending = []
+                log(f"  {imported + failed}/{len(jobs)} ({time.time() - started:.1f}s)")
+    if pending:
+        save_records(conn, pending, datetime.now().isoformat(timespec="seconds"))
+    conn.close()
+    log(f"Imported {imported}, failed {failed} in {time.time() - started:.1f}s")
+    return imported, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import archived OOS reports (PDF/DOCX) into the local investigation store.")
+    parser.add_argument("roots", nargs="+", help="Folders to scan for filled PDF and DOCX reports")
+    parser.add_argument("--db", default=STORE_FILE, help=f"Store path (default: {STORE_FILE})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Records saved per checkpoint")
+    parser.add_argument("--templates", default=TEMPLATE_DIR, help="Folder holding the '<platform> OOS template.docx' files")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-read files that failed on a previous run")
+    args = parser.parse_args(argv)
+    _, failed = run_backfill(args.roots, args.db, args.workers, args.batch_size, args.retry_failed, args.templates)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import sqlite3
+import json
+
+# --- LOCAL INVESTIGATION STORE ---
+# Indexed SQLite copy of previously issued OOS reports, filled by backfill.py.
+# Only the columns used for history / cross-contamination lookups are broken
+# out; everything else extracted from a report is kept in the JSON "fields".
+STORE_FILE = "investigation_history.db"
+
+indexed_keys = ["oos_id", "client_name", "sample_id", "sample_name", "lot_number", "test_date", "analyst_initial", "active_platform"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS investigations (
+    source_path TEXT PRIMARY KEY,
+    source_mtime REAL NOT NULL,
+    source_size INTEGER NOT NULL,
+    source_kind TEXT NOT NULL,
+    {", ".join(f"{k} TEXT" for k in indexed_keys)},
+    fields TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS import_errors (
+    source_path TEXT PRIMARY KEY,
+    source_mtime REAL NOT NULL,
+    source_size INTEGER NOT NULL,
+    error TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_inv_oos ON investigations (oos_id);
+CREATE INDEX IF NOT EXISTS idx_inv_sample_id ON investigations (sample_id);
+CREATE INDEX IF NOT EXISTS idx_inv_client_sample ON investigations (client_name, sample_name);
+CREATE INDEX IF NOT EXISTS idx_inv_test_date ON investigations (test_date);
+"""
+
+def open_store(path=STORE_FILE):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def imported_sources(conn):
+    # (mtime, size) per path already handled, imported or failed; this is the
+    # resume checkpoint for the backfill importer.
+    done = {}
+    for table in ("investigations", "import_errors"):
+        for row in conn.execute(f"SELECT source_path, source_mtime, source_size FROM {table}"):
+            done[row["source_path"]] = (row["source_mtime"], row["source_size"])
+    return done
+
+def failed_sources(conn):
+    return {row["source_path"] for row in conn.execute("SELECT source_path FROM import_errors")}
+
+def save_records(conn, records, imported_at):
+    with conn:
+        for rec in records:
+            if rec.get("error"):
+                conn.execute(
+                    "INSERT OR REPLACE INTO import_errors VALUES (?, ?, ?, ?)",
+                    (rec["path"], rec["mtime"], rec["size"], rec["error"]),
+                )
+                conn.execute("DELETE FROM investigations WHERE source_path = ?", (rec["path"],))
+                continue
+            fields = rec["fields"]
+            conn.execute("DELETE FROM import_errors WHERE source_path = ?", (rec["path"],))
+            conn.execute(
+                f"INSERT OR REPLACE INTO investigations VALUES ({', '.join('?' * (len(indexed_keys) + 6))})",
+                (rec["path"], rec["mtime"], rec["size"], rec["kind"],
+                 *[fields.get(k, "") for k in indexed_keys],
+                 json.dumps(fields), imported_at),
+            )
+
+def _rows_to_dicts(rows):
+    out = []
+    for row in rows:
+        item = dict(row)
+        item["fields"] = json.loads(item["fields"])
+        out.append(item)
+    return out
+
+def find_by_oos(conn, oos_id):
+    rows = conn.execute("SELECT * FROM investigations WHERE oos_id = ?", (str(oos_id).strip(),))
+    return _rows_to_dicts(rows)
+
+def find_by_sample(conn, client_name, sample_name):
+    # Sample history lookup: earlier reports for the same client / analyte.
+    rows = conn.execute(
+        "SELECT * FROM investigations WHERE client_name = ? AND sample_name = ? ORDER BY oos_id",
+        (client_name.strip(), sample_name.strip()),
+    )
+    return _rows_to_dicts(rows)
+
+def find_by_test_date(conn, test_date):
+    # Cross-contamination lookup: other positives reported for the same test date.
+    rows = conn.execute("SELECT * FROM investigations WHERE test_date = ? ORDER BY sample_id", (test_date.strip(),))
+    return _rows_to_dicts(rows)
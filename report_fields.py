@@ -0,0 +1,48 @@
+# --- REPORT FIELD NAMES ---
+# Shared by the app and the backfill importer; these are the keys saved to
+# investigation_state.json and filled into the PDF/DOCX templates.
+field_keys = [
+    "oos_id", "client_name", "sample_id", "test_date", "sample_name", "lot_number", 
+    "dosage_form", "monthly_cleaning_date", 
+    "prepper_initial", "prepper_name", 
+    "analyst_initial", "analyst_name",
+    "changeover_initial", "changeover_name",
+    "reader_initial", "reader_name",
+    "bsc_id", "chgbsc_id", "scan_id", 
+    "shift_number", "active_platform",
+    "org_choice", "manual_org", "test_record", "control_pos", "control_lot", 
+    "control_exp", "obs_pers", "etx_pers", "id_pers", "obs_surf", "etx_surf", 
+    "id_surf", "obs_sett", "etx_sett", "id_sett", "obs_air", "etx_air_weekly", 
+    "id_air_weekly", "obs_room", "etx_room_weekly", "id_room_wk_of", "weekly_init", 
+    "date_weekly", "equipment_summary", "narrative_summary", "em_details", 
+    "sample_history_paragraph", "incidence_count", "oos_refs",
+    "other_positives", "cross_contamination_summary",
+    "total_pos_count_num", "current_pos_order",
+    "diff_changeover_bsc", "has_prior_failures",
+    "em_growth_observed", "diff_changeover_analyst",
+    "diff_reader_analyst",
+    "em_growth_count" 
+]
+# Dynamic keys
+for i in range(20):
+    field_keys.append(f"other_id_{i}")
+    field_keys.append(f"other_order_{i}")
+    field_keys.append(f"prior_oos_{i}")
+    field_keys.append(f"em_cat_{i}")
+    field_keys.append(f"em_obs_{i}")
+    field_keys.append(f"em_etx_{i}")
+    field_keys.append(f"em_id_{i}")
+
+# AcroForm field names in "<platform> OOS template.pdf" -> app keys. Most of
+# the template's fields are generic ("Text Field4"); only these carry a single
+# app value. Several fields can map to the same key.
+pdf_field_map = {
+    "oos_id": "oos_id", "Text Field57": "oos_id",
+    "Text Field3": "analyst_name",
+    "Date Field0": "test_date", "Date Field2": "test_date",
+    "sample_id": "sample_id",
+    "Text Field4": "sample_name",
+    "dosage_form": "dosage_form",
+    "Text Field6": "lot_number",
+    "Text Field24": "control_pos", "Text Field25": "control_lot", "Text Field26": "control_exp",
+}
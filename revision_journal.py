@@ -0,0 +1,118 @@
+import sqlite3
+import json
+import difflib
+from datetime import datetime
+
+# --- NARRATIVE REVISION JOURNAL ---
+# Each save of an investigation's narrative fields is stored as a delta against
+# the previous revision, with a full checkpoint every CHECKPOINT_EVERY
+# revisions. Restoring a revision replays at most CHECKPOINT_EVERY - 1 deltas
+# on top of the nearest checkpoint.
+JOURNAL_FILE = "investigation_journal.db"
+CHECKPOINT_EVERY = 10
+
+journal_keys = ["narrative_summary", "em_details", "sample_history_paragraph", "cross_contamination_summary"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    oos_id TEXT NOT NULL,
+    rev INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    body TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    PRIMARY KEY (oos_id, rev)
+);
+"""
+
+def open_journal(path=JOURNAL_FILE):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+# --- DELTAS ---
+def make_delta(old, new):
+    # Edits as [start, end, replacement] against `old`; the common prefix and
+    # suffix are trimmed first so typical local edits diff in linear time.
+    if old == new: return []
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]: prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]: suffix += 1
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal": ops.append([prefix + i1, prefix + i2, new_mid[j1:j2]])
+    return ops
+
+def apply_delta(old, ops):
+    parts, pos = [], 0
+    for start, end, text in ops:
+        parts.append(old[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(old[pos:])
+    return "".join(parts)
+
+# --- READ ---
+def latest_rev(conn, oos_id):
+    row = conn.execute("SELECT MAX(rev) AS rev FROM revisions WHERE oos_id = ?", (oos_id,)).fetchone()
+    return row["rev"] or 0
+
+def list_revisions(conn, oos_id):
+    rows = conn.execute("SELECT rev, kind, saved_at, LENGTH(body) AS size FROM revisions WHERE oos_id = ? ORDER BY rev", (oos_id,))
+    return [dict(r) for r in rows]
+
+def restore_revision(conn, oos_id, rev=None):
+    if rev is None: rev = latest_rev(conn, oos_id)
+    base = conn.execute(
+        "SELECT rev, body FROM revisions WHERE oos_id = ? AND rev <= ? AND kind = 'full' ORDER BY rev DESC LIMIT 1",
+        (oos_id, rev),
+    ).fetchone()
+    if base is None: return None
+    fields = json.loads(base["body"])
+    deltas = conn.execute(
+        "SELECT body FROM revisions WHERE oos_id = ? AND rev > ? AND rev <= ? ORDER BY rev",
+        (oos_id, base["rev"], rev),
+    )
+    for row in deltas:
+        for key, ops in json.loads(row["body"]).items():
+            fields[key] = apply_delta(fields.get(key, ""), ops)
+    return fields
+
+def diff_revisions(conn, oos_id, rev_a, rev_b):
+    # Unified diff per changed field between two revisions
+    old = restore_revision(conn, oos_id, rev_a) or {}
+    new = restore_revision(conn, oos_id, rev_b) or {}
+    out = {}
+    for key in journal_keys:
+        a, b = old.get(key, ""), new.get(key, "")
+        if a == b: continue
+        lines = difflib.unified_diff(a.splitlines(), b.splitlines(), f"rev {rev_a}", f"rev {rev_b}", lineterm="")
+        out[key] = "\n".join(lines)
+    return out
+
+# --- WRITE ---
+def record_revision(conn, oos_id, values):
+    # Returns the new revision number, or None when nothing changed.
+    fields = {k: str(values.get(k) or "") for k in journal_keys}
+    prev_rev = latest_rev(conn, oos_id)
+    prev = restore_revision(conn, oos_id, prev_rev) if prev_rev else None
+    if prev == fields: return None
+
+    rev = prev_rev + 1
+    full_body = json.dumps(fields)
+    kind, body = "full", full_body
+    if prev is not None and rev % CHECKPOINT_EVERY != 1:
+        delta = {k: make_delta(prev.get(k, ""), v) for k, v in fields.items()}
+        delta_body = json.dumps({k: ops for k, ops in delta.items() if ops})
+        if len(delta_body) < len(full_body): kind, body = "delta", delta_body
+    with conn:
+        conn.execute(
+            "INSERT INTO revisions VALUES (?, ?, ?, ?, ?)",
+            (oos_id, rev, kind, body, datetime.now().isoformat(timespec="seconds")),
+        )
+    return rev
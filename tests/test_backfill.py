@@ -0,0 +1,94 @@
+import os
+import shutil
+from collections import defaultdict
+
+from docxtpl import DocxTemplate
+from pypdf import PdfReader, PdfWriter
+
+from backfill import TEMPLATE_DIR, block_pattern, extract_docx, extract_pdf, extract_report, run_backfill
+from investigation_store import find_by_oos, open_store, save_records
+
+DOCX_TEMPLATE = os.path.join(TEMPLATE_DIR, "ScanRDI OOS template.docx")
+PDF_TEMPLATE = os.path.join(TEMPLATE_DIR, "ScanRDI OOS template.pdf")
+
+report_data = {
+    "oos_id": "1234",
+    "analyst_name": "Qiyue Chen", "analyst_initial": "QYC",
+    "prepper_name": "Guanchen Li", "prepper_initial": "GL",
+    "reader_name": "Qiyue Chen", "reader_initial": "QYC",
+    "changeover_name": "Qiyue Chen", "changeover_initial": "QYC",
+    "test_date": "07Jan26", "sample_id": "ETX-260107-0001",
+    "client_name": "Acme Pharma (E12345)", "sample_name": "Ceftriaxone",
+    "lot_number": "L-88 / B2", "dosage_form": "Injectable",
+    "control_positive": "B. subtilis", "control_lot": "CL1", "control_data": "01Jan27",
+    "narrative_summary": "Upon analyzing the environmental monitoring results, no growth.\n\nMore.",
+    "cross_contamination_summary": "All other samples tested negative.",
+    "obs_pers_dur": "No Growth", "weekly_initial": "GL",
+}
+
+def render_report(path):
+    doc = DocxTemplate(DOCX_TEMPLATE)
+    doc.render(defaultdict(str, report_data))
+    doc.save(str(path))
+
+def test_block_pattern_repeated_placeholder():
+    pattern = block_pattern("On {{ test_date }}, {{ sample_id }} / {{ test_date }}")
+    m = pattern.fullmatch("On 07Jan26, ETX-1 / 07Jan26")
+    assert m.groupdict() == {"test_date": "07Jan26", "sample_id": "ETX-1"}
+    assert pattern.fullmatch("On 07Jan26, ETX-1 / 08Jan26") is None
+
+def test_extract_docx_round_trip(tmp_path):
+    path = tmp_path / "OOS-1234 Acme Pharma (E12345) (ETX-260107-0001) - ScanRDI.docx"
+    render_report(path)
+    fields = extract_docx(str(path), TEMPLATE_DIR)
+    assert fields["oos_id"] == "1234"
+    assert fields["active_platform"] == "ScanRDI"
+    assert fields["control_pos"] == "B. subtilis"
+    assert fields["control_exp"] == "01Jan27"
+    assert fields["obs_pers"] == "No Growth"
+    assert fields["weekly_init"] == "GL"
+    for key in ["analyst_name", "prepper_name", "test_date", "sample_id", "client_name", "sample_name", "lot_number", "dosage_form", "narrative_summary", "cross_contamination_summary"]:
+        assert fields[key] == report_data[key].strip(), key
+
+def test_extract_docx_reads_oos_number_from_header(tmp_path):
+    path = tmp_path / "report.docx"
+    render_report(path)
+    record = extract_report((str(path), 0.0, 0, TEMPLATE_DIR))
+    assert "error" not in record
+    assert record["fields"]["oos_id"] == "1234"
+    assert record["fields"]["sample_id"] == "ETX-260107-0001"
+
+def test_extract_pdf_uses_template_field_names(tmp_path):
+    writer = PdfWriter(clone_from=PdfReader(PDF_TEMPLATE))
+    personnel = "Prepper:\nGuanchen Li (GL)\n\nProcessor:\nQiyue Chen (QYC)\n\nChangeover Processor:\nGuanchen Li (GL)"
+    values = {"oos_id": "OOS-77", "Text Field0": "Kathan Parikh", "Text Field3": personnel, "Text Field4": "Ceftriaxone", "Text Field6": "L-88", "Date Field0": "07Jan26"}
+    writer.update_page_form_field_values(writer.pages[0], values, auto_regenerate=False)
+    path = tmp_path / "OOS-77 Acme Pharma (E12345) - ScanRDI.pdf"
+    writer.write(str(path))
+    fields = extract_pdf(str(path))
+    assert fields["sample_name"] == "Ceftriaxone"
+    assert fields["lot_number"] == "L-88"
+    assert fields["test_date"] == "07Jan26"
+    assert fields["analyst_name"] == "Qiyue Chen"
+    assert fields["client_name"] == "Acme Pharma (E12345)"
+
+def test_backfill_resumes_and_rejects_non_reports(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    render_report(archive / "OOS-1234 Acme Pharma (E12345) (ETX-260107-0001) - ScanRDI.docx")
+    shutil.copy(DOCX_TEMPLATE, archive / "junk.docx")
+    db = str(tmp_path / "history.db")
+
+    assert run_backfill([str(archive)], db, workers=1, log=lambda msg: None) == (1, 1)
+    conn = open_store(db)
+    rows = conn.execute("SELECT oos_id, sample_id FROM investigations").fetchall()
+    assert [tuple(r) for r in rows] == [("1234", "ETX-260107-0001")]
+    conn.close()
+
+    assert run_backfill([str(archive)], db, workers=1, log=lambda msg: None) == (0, 0)
+
+def test_failed_reimport_drops_stale_investigation(tmp_path):
+    conn = open_store(str(tmp_path / "history.db"))
+    save_records(conn, [{"path": "a.docx", "mtime": 1.0, "size": 1, "kind": "docx", "fields": {"oos_id": "1"}}], "now")
+    save_records(conn, [{"path": "a.docx", "mtime": 2.0, "size": 2, "kind": "docx", "error": "ValueError: bad"}], "now")
+    assert find_by_oos(conn, "1") == []
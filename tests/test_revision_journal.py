@@ -0,0 +1,64 @@
+import random
+
+from revision_journal import CHECKPOINT_EVERY, apply_delta, diff_revisions, journal_keys, list_revisions, make_delta, open_journal, record_revision, restore_revision
+
+def test_delta_round_trip():
+    cases = [
+        ("", ""), ("", "new text"), ("old text", ""),
+        ("Upon analyzing", "Xpon analyzing"),
+        ("Upon analyzing", "Upon analyzinG."),
+        ("ends here", "starts: ends here"),
+        ("abcabcabc", "abcXabc"),
+        ("Analyte “Ceftriaxone” at 30-35°C", "Analyte “Cefazolin” at 20–25°C ✓"),
+        ("µ-organisms\nline two\n", "line two\nµ-organisms\n"),
+    ]
+    for old, new in cases:
+        assert apply_delta(old, make_delta(old, new)) == new, (old, new)
+    assert make_delta("same", "same") == []
+
+def test_delta_round_trip_random_edits():
+    rng = random.Random(7)
+    alphabet = "ab c\n°“”é"
+    text = "".join(rng.choice(alphabet) for _ in range(500))
+    for _ in range(300):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.randrange(10))
+        new = text[:start] + "".join(rng.choice(alphabet) for _ in range(rng.randrange(8))) + text[end:]
+        assert apply_delta(text, make_delta(text, new)) == new
+        text = new
+
+def test_restore_every_revision_across_checkpoints(tmp_path):
+    conn = open_journal(str(tmp_path / "journal.db"))
+    fields = {k: f"{k} draft" for k in journal_keys}
+    history = []
+    for i in range(CHECKPOINT_EVERY * 2 + 3):
+        key = journal_keys[i % len(journal_keys)]
+        fields = dict(fields)
+        fields[key] = f"Edit {i}: " + fields[key]
+        assert record_revision(conn, "555", fields) == i + 1
+        history.append(fields)
+
+    kinds = [r["kind"] for r in list_revisions(conn, "555")]
+    assert kinds[0] == kinds[CHECKPOINT_EVERY] == kinds[2 * CHECKPOINT_EVERY] == "full"
+    assert "delta" in kinds
+    for rev, expected in enumerate(history, 1):
+        assert restore_revision(conn, "555", rev) == expected
+    assert restore_revision(conn, "555") == history[-1]
+    assert restore_revision(conn, "other") is None
+
+def test_record_revision_skips_unchanged(tmp_path):
+    conn = open_journal(str(tmp_path / "journal.db"))
+    values = {"narrative_summary": "First", "em_details": ""}
+    assert record_revision(conn, "555", values) == 1
+    assert record_revision(conn, "555", dict(values)) is None
+    assert record_revision(conn, "556", values) == 1
+    assert len(list_revisions(conn, "555")) == 1
+
+def test_diff_revisions(tmp_path):
+    conn = open_journal(str(tmp_path / "journal.db"))
+    record_revision(conn, "555", {"narrative_summary": "line one\nline two", "em_details": "same"})
+    record_revision(conn, "555", {"narrative_summary": "line one\nline 2", "em_details": "same"})
+    diffs = diff_revisions(conn, "555", 1, 2)
+    assert list(diffs) == ["narrative_summary"]
+    assert diffs["narrative_summary"].splitlines() == ["--- rev 1", "+++ rev 2", "@@ -1,2 +1,2 @@", " line one", "-line two", "+line 2"]
+    assert diff_revisions(conn, "555", 2, 2) == {}